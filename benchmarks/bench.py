@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# Four benchmarks
+# Times the interpreter on generated projects, made with love ❤️
+#
+#   python3 benchmarks/bench.py --save           -> Store this run as the baseline, do this first
+#   python3 benchmarks/bench.py                  -> Run everything, compare with baseline.json
+#   python3 benchmarks/bench.py --only define    -> Run the benchmarks whose name contains "define"
+#
+# Everything is generated into a temporary directory, nothing is downloaded.
+# Times depend on the machine (run and build also on its disk), so no baseline
+# is shipped: save one on your box before your change, then compare after it.
+# A baseline from another kind of machine is reported and not compared.
+
+import sys
+import os
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+import statistics
+from importlib.machinery import SourceFileLoader
+from importlib.util import spec_from_loader, module_from_spec
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_FOUR = os.path.join(HERE, '..', 'install-files', 'four')
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+MB = 1024 * 1024
+NOISE_SECONDS = 0.002  # Differences this small are timer and scheduler noise
+
+def load_four(path):
+    """Import a four script (it has no .py extension) as a module"""
+    loader = SourceFileLoader('four', path)
+    module = module_from_spec(spec_from_loader('four', loader))
+    loader.exec_module(module)
+    return module
+
+def machine_fingerprint():
+    """What a baseline's times depend on besides the code"""
+    return {'machine': platform.machine(), 'cpus': os.cpu_count(), 'python': platform.python_version()}
+
+def header(name, run='true'):
+    # A run command that exits right away, so run_app measures four and not the app
+    return [f'PROJECT "{name}"', 'CONFIGURE["platform", "all"]', f'CONFIGURE["run", "{run}"]',
+            'CONFIGURE["version", "1.0"]']
+
+def text_blob(rng, size):
+    """Compressible, code-like text"""
+    words = ['love', 'four', 'print', 'return', 'value', 'index', 'heart', 'build', '=', '+', '(', ')']
+    lines = []
+    total = 0
+    while total < size:
+        line = ' '.join(rng.choice(words) for _ in range(rng.randint(3, 12)))
+        lines.append(line)
+        total += len(line) + 1
+    return '\n'.join(lines)[:size]
+
+def write_project(root, name, lines, assets=()):
+    """Write name.four plus its FILE assets, returning (four path, bytes of input)"""
+    total = 0
+    for rel, data in assets:
+        path = os.path.join(root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(data)
+        total += len(data)
+    four_file = os.path.join(root, f'{name}.four')
+    with open(four_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return four_file, total + os.path.getsize(four_file)
+
+def gen_define_tiny(root, scale, rng):
+    lines = header('define_tiny') + ['DEFINE MAIN', 'print("Hello with love")']
+    return write_project(root, 'define_tiny', lines)
+
+def gen_define_large(root, scale, rng):
+    lines = header('define_large') + ['DEFINE MAIN', text_blob(rng, int(8 * MB * scale))]
+    return write_project(root, 'define_large', lines)
+
+def gen_exports_multiline(root, scale, rng):
+    lines = header('exports_multiline')
+    for i in range(max(1, int(50 * scale))):
+        body = text_blob(rng, 64 * 1024).replace('"', "'").split('\n')
+        lines.append(f'EXPORT value{i}["' + body[0])
+        lines.extend(body[1:])
+        lines[-1] += '"]'
+    lines += ['DEFINE MAIN', 'print("exports")']
+    return write_project(root, 'exports_multiline', lines)
+
+def gen_files_many_small(root, scale, rng):
+    lines = header('files_many_small') + ['FOLDER "assets"']
+    assets = []
+    for i in range(max(1, int(1000 * scale))):
+        rel = f'small/{i // 100}/item{i}.txt'
+        assets.append((rel, text_blob(rng, 4096).encode('utf-8')))
+        lines.append(f'FILE "{rel}" "assets/{rel}"')
+    lines += ['DEFINE MAIN', 'print("many files")']
+    return write_project(root, 'files_many_small', lines, assets)
+
+def gen_files_few_huge(root, scale, rng):
+    size = int(16 * MB * scale)
+    assets = [
+        ('huge/text.txt', text_blob(rng, size).encode('utf-8')),
+        ('huge/noise.bin', rng.randbytes(size)),      # Incompressible, deflated anyway
+        ('huge/picture.png', rng.randbytes(size)),    # Stored as it is
+    ]
+    lines = header('files_few_huge') + [f'FILE "{rel}" "{rel}"' for rel, _ in assets]
+    lines += ['DEFINE MAIN', 'print("huge files")']
+    return write_project(root, 'files_few_huge', lines, assets)
+
+GENERATORS = {
+    'define_tiny': gen_define_tiny,
+    'define_large': gen_define_large,
+    'exports_multiline': gen_exports_multiline,
+    'files_many_small': gen_files_many_small,
+    'files_few_huge': gen_files_few_huge,
+}
+
+class Project:
+    """A generated project and the operations benchmarked on it"""
+
+    def __init__(self, four, root, four_file, input_bytes):
+        self.four = four
+        self.root = root
+        self.four_file = four_file
+        self.input_bytes = input_bytes
+        self.app_file = os.path.splitext(four_file)[0] + '.app'
+        self.cache = four.FourCache(root=os.path.join(root, 'cache'))
+
+    def parsed(self):
+        interpreter = self.four.FourInterpreter()
+        interpreter.parse_file(self.four_file)
+        return interpreter
+
+    def parse(self):
+        self.parsed()
+
+    def build(self):
+        self.parsed().build(self.app_file, force=True)
+
+    def rebuild(self):
+        # Nothing changed, so this is the manifest check alone
+        self.parsed().build(self.app_file)
+
+    def info(self):
+        self.four.FourInterpreter().show_info(self.app_file)
+
+    def run(self):
+        self.check(self.four.FourInterpreter().run_app(self.app_file))
+
+    def run_cached(self):
+        self.check(self.four.FourInterpreter().run_app(self.app_file, cache=self.cache))
+
+    @staticmethod
+    def check(code):
+        if code != 0:
+            raise RuntimeError(f"app exited with {code}")
+
+    def input_size(self, op):
+        """Bytes an operation goes through, for throughput"""
+        if op == 'parse':
+            return os.path.getsize(self.four_file)
+        if op in ('info', 'run', 'run_cached'):
+            return os.path.getsize(self.app_file)
+        return self.input_bytes
+
+OPERATIONS = ('parse', 'build', 'rebuild', 'info', 'run', 'run_cached')
+
+def measure(func, repeat):
+    """Best and median wall time over repeat calls, then peak traced memory of one more"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return min(times), statistics.median(times), peak
+
+def run_benchmarks(four, scale, repeat, only):
+    results = {}
+    with tempfile.TemporaryDirectory(prefix='four-bench-') as tmp:
+        for name, generate in GENERATORS.items():
+            wanted = [op for op in OPERATIONS if not only or any(word in f'{name}.{op}' for word in only)]
+            if not wanted:
+                continue
+            root = os.path.join(tmp, name)
+            os.makedirs(root)
+            # Seeded per project, so --only picks the same content a full run does
+            project = Project(four, root, *generate(root, scale, random.Random(name)))
+            cwd = os.getcwd()
+            os.chdir(root)
+            try:
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    project.build()
+                    for op in wanted:
+                        best, median, peak = measure(getattr(project, op), repeat)
+                        results[f'{name}.{op}'] = {
+                            'seconds': best,
+                            'median': median,
+                            'peak_bytes': peak,
+                            'bytes': project.input_size(op),
+                        }
+            finally:
+                os.chdir(cwd)
+            for key in (f'{name}.{op}' for op in wanted):
+                report_line(key, results[key])
+    return results
+
+def fmt_bytes(size):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def report_line(key, result, verdict=''):
+    throughput = result['bytes'] / result['seconds'] / MB if result['seconds'] else 0
+    print(f"{key:<30} {result['seconds'] * 1000:10.2f} ms {throughput:10.1f} MB/s "
+          f"{fmt_bytes(result['peak_bytes']):>10} peak  {verdict}".rstrip())
+    sys.stdout.flush()
+
+def compare(results, baseline, tolerance):
+    """Return the benchmarks that got slower or hungrier than the baseline allows"""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        for field, label, floor in (('seconds', 'time', NOISE_SECONDS), ('peak_bytes', 'memory', 0)):
+            if base[field] and result[field] > base[field] * (1 + tolerance) and result[field] - base[field] > floor:
+                regressions.append(f"{key}: {label} {result[field] / base[field]:.2f}x the baseline")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark four with love ❤️")
+    parser.add_argument('--four', default=DEFAULT_FOUR, help="four script to benchmark")
+    parser.add_argument('--scale', type=float, default=1.0, help="multiply every generated size (default 1)")
+    parser.add_argument('--repeat', type=int, default=5, help="timed calls per benchmark, best one counts")
+    parser.add_argument('--only', nargs='+', default=[], help="run benchmarks whose name contains any of these")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON to compare with")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="allowed slowdown before failing (default 0.25)")
+    parser.add_argument('--save', action='store_true', help="store this run as the baseline")
+    parser.add_argument('--json', help="also write the results to this file")
+    args = parser.parse_args()
+
+    four = load_four(os.path.abspath(args.four))
+    print(f"Benchmarking {os.path.relpath(args.four)} at scale {args.scale:g} on "
+          f"{platform.python_implementation()} {platform.python_version()}, {platform.machine()}")
+    results = run_benchmarks(four, args.scale, args.repeat, args.only)
+
+    document = {'scale': args.scale, 'fingerprint': machine_fingerprint(), 'results': results}
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+    if args.save:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"Saved baseline to {os.path.relpath(args.baseline)}")
+        return 0
+
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print("No baseline yet, save one with --save")
+        return 0
+    if baseline.get('scale') != args.scale:
+        print(f"Baseline was taken at scale {baseline.get('scale')}, not comparing")
+        return 0
+    if baseline.get('fingerprint') != document['fingerprint']:
+        print(f"Baseline was taken on another machine ({baseline.get('fingerprint')}), not comparing")
+        return 0
+    regressions = compare(results, baseline['results'], args.tolerance)
+    for line in regressions:
+        print(f"SLOWER {line}")
+    print(f"{len(regressions)} regressions against {os.path.relpath(args.baseline)} "
+          f"(tolerance {args.tolerance:.0%})")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -13,15 +13,642 @@ import zipfile
 import platform
 import time
 import hashlib
+import contextlib
+import struct
+import glob
+import zlib
+import codecs
+import io
+import signal
+import threading
+import stat
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+CACHE_MAX_SIZE = 1024 * 1024 * 1024  # 1 GiB of extracted apps
+CACHE_STALE_SECONDS = 3600  # Staging dirs left behind by crashed launches
+MANIFEST_NAME = '.four-manifest.json'
+MANIFEST_VERSION = 1
+CHUNK_SIZE = 1024 * 1024
+COMPRESS_LEVEL = 9
+# Already compressed formats gain nothing from deflate, so they are stored
+STORED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z',
+                     '.mp3', '.ogg', '.mp4', '.webm'}
+GENERATED_DATE_TIME = (1980, 1, 1, 0, 0, 0)  # Fixed so builds are reproducible
+PIPE_CHUNK_SIZE = 64 * 1024
+FICLONE = 0x40049409  # Linux ioctl sharing a file's blocks with a copy until either is written
+# Sent to four itself by kill/logout; the console already delivers Ctrl+C and Ctrl+Break to the app
+FORWARDED_SIGNALS = [getattr(signal, name) for name in ('SIGTERM', 'SIGHUP') if hasattr(signal, name)]
+
+PROJECT_RE = re.compile(r'PROJECT\s+"([^"]+)"')
+WINDOWS_RESERVED_RE = re.compile(r'[<>:"/\\|?*]')
+CONFIGURE_RE = re.compile(r'CONFIGURE\["([^"]+)",\s*"([^"]+)"\]')
+EXPORT_STRING_RE = re.compile(r'EXPORT\s+(\w+)\["([^"]+)"\]')
+EXPORT_NUMERO_RE = re.compile(r'EXPORT\s+(\w+)\[(\d+)\]')
+EXPORT_FLOAT_RE = re.compile(r'EXPORT\s+(\w+)\[(\d+\.?\d*)\]')
+EXPORT_BOOL_RE = re.compile(r'EXPORT\s+(\w+)\[(true|false)\]')
+EXPORT_OPEN_RE = re.compile(r'EXPORT\s+(\w+)\["')
+FOLDER_RE = re.compile(r'FOLDER\s+"([^"]+)"')
+FILE_RE = re.compile(r'FILE\s+"([^"]+)"\s+"([^"]+)"')
+DEFINE_RE = re.compile(r'DEFINE\s+(\w+)')
+
 class FourError(Exception):
     """Four errors with love"""
     def __init__(self, message):
         self.message = message
         super().__init__(self.message)
 
+def format_size(size):
+    """Format a byte count for humans"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def parse_size(text):
+    """Parse sizes like 500M or 2G into bytes"""
+    units = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+    text = text.strip().upper().rstrip('B')
+    try:
+        if text and text[-1] in units:
+            return int(float(text[:-1]) * units[text[-1]])
+        return int(text)
+    except ValueError:
+        raise FourError(f"Error with love: Invalid size '{text}' ❤️")
+
+def file_sha256(path):
+    """SHA-256 of a file, read in chunks"""
+    with open(path, 'rb') as f:
+        return stream_sha256(f)
+
+def stream_sha256(f):
+    """SHA-256 of an open file from its start, leaving its position as it was"""
+    digest = hashlib.sha256()
+    position = f.tell()
+    f.seek(0)
+    for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+        digest.update(chunk)
+    f.seek(position)
+    return digest.hexdigest()
+
+def copy_bytes(src, dst, length):
+    """Copy exactly length bytes from src to dst"""
+    remaining = length
+    while remaining:
+        chunk = src.read(min(remaining, CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile("Truncated member data")
+        dst.write(chunk)
+        remaining -= len(chunk)
+
+def pack_file(src, dst, compress_type, level):
+    """Store or deflate the file src into the open file dst.
+
+    Returns (CRC, file_size, compress_size). Both the serial and the
+    parallel build go through here, so the bytes never depend on --jobs.
+    """
+    crc = file_size = compress_size = 0
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if compress_type == zipfile.ZIP_DEFLATED else None
+    with open(src, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+            dst.write(chunk)
+            compress_size += len(chunk)
+    if compressor is not None:
+        chunk = compressor.flush()
+        dst.write(chunk)
+        compress_size += len(chunk)
+    return crc, file_size, compress_size
+
+def pack_file_to_spool(src, spool_path, compress_type, level):
+    """Process pool entry point: pack src into its own spool file"""
+    with open(spool_path, 'wb') as dst:
+        return pack_file(src, dst, compress_type, level)
+
+def write_raw_member(zipf, zinfo, write_data):
+    """Append a member to zipf whose compressed bytes come from write_data(fp)"""
+    zinfo.flag_bits &= ~0x08  # Sizes are known, so no data descriptor
+    zip64 = zinfo.file_size * 1.05 > zipfile.ZIP64_LIMIT
+    fp = zipf.fp
+    fp.seek(zipf.start_dir)
+    zinfo.header_offset = fp.tell()
+    fp.write(zinfo.FileHeader(zip64))
+    write_data(fp)
+    end = fp.tell()
+    # Rewrite the local header now that CRC and sizes are final
+    fp.seek(zinfo.header_offset)
+    fp.write(zinfo.FileHeader(zip64))
+    fp.seek(end)
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+    zipf.start_dir = end
+    zipf._didModify = True
+
+def copy_member(src_zip, info, dst_zip, zinfo):
+    """Copy a member's compressed bytes from src_zip into dst_zip as they are, under the header zinfo"""
+    fp = src_zip.fp
+    fp.seek(info.header_offset)
+    header = fp.read(30)
+    if header[:4] != b'PK\x03\x04':
+        raise zipfile.BadZipFile(f"Bad local header for {info.filename}")
+    name_length, extra_length = struct.unpack('<HH', header[26:30])
+    fp.seek(name_length + extra_length, os.SEEK_CUR)
+    zinfo.compress_type = info.compress_type
+    zinfo.CRC = info.CRC
+    zinfo.compress_size = info.compress_size
+    zinfo.file_size = info.file_size
+    write_raw_member(dst_zip, zinfo, lambda dst: copy_bytes(fp, dst, info.compress_size))
+
+@contextlib.contextmanager
+def atomic_output(path):
+    """Write path through a temp file in the same dir, renamed into place on success"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            yield f
+        umask = os.umask(0)
+        os.umask(umask)
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def lock_file(f, blocking=True):
+    """Lock an open file exclusively across processes; False if busy and not blocking"""
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+def unlock_file(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def remove_tree(path):
+    """rmtree that also removes read-only files, and never raises"""
+    def make_writable(func, failed_path, exc):
+        # Cache entries are read-only, their directories included
+        for path in (os.path.dirname(failed_path), failed_path):
+            try:
+                os.chmod(path, stat.S_IRWXU)
+            except OSError:
+                pass
+        try:
+            func(failed_path)
+        except OSError:
+            pass
+    if sys.version_info >= (3, 12):
+        shutil.rmtree(path, onexc=make_writable)
+    else:
+        shutil.rmtree(path, onerror=make_writable)
+
+def clone_file(src, dst):
+    """Copy src to a new writable file dst, as a reflink where the filesystem can"""
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        if fcntl is not None and sys.platform.startswith('linux'):
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass  # Not btrfs, XFS or another filesystem that shares blocks
+        shutil.copyfileobj(fsrc, fdst, CHUNK_SIZE)
+
+def clone_tree(src, dst):
+    """Writable copy of everything under src into the directory dst"""
+    for folder_name, _, files in os.walk(src):
+        target = os.path.join(dst, os.path.relpath(folder_name, src))
+        os.makedirs(target, exist_ok=True)
+        for file in files:
+            clone_file(os.path.join(folder_name, file), os.path.join(target, file))
+
+def pump_output(src, sinks):
+    """Copy a pipe to sinks as soon as bytes arrive, never holding more than one chunk"""
+    for chunk in iter(lambda: src.read(PIPE_CHUNK_SIZE), b''):
+        for sink in sinks:
+            sink.write(chunk)
+            sink.flush()
+
+def wait_child(proc):
+    """Wait for proc, letting our signal handlers run meanwhile"""
+    if os.name != 'nt':
+        return proc.wait()
+    # A blocking wait on Windows holds signal handlers back until the app has exited
+    while True:
+        try:
+            return proc.wait(timeout=0.1)
+        except subprocess.TimeoutExpired:
+            pass
+
+def run_child(command, cwd, log_file=None, shell=False, profiler=None):
+    """Run an app with its output going straight to ours, teed to log_file if given.
+
+    Returns the exit status, with deaths by signal reported as 128 + signal like a shell.
+    """
+    profiler = profiler or FourProfiler()
+    sys.stdout.flush()
+    sys.stderr.flush()
+    log = None
+    pumps = []
+    if log_file is not None:
+        try:
+            log = open(log_file, 'wb')
+        except OSError as e:
+            raise FourError(f"Error with love: Cannot write log {log_file}: {e.strerror} ❤️")
+    try:
+        with profiler.span('spawn'):
+            if log is None:
+                proc = subprocess.Popen(command, cwd=cwd, shell=shell)
+            else:
+                # Python apps block-buffer when writing to a pipe, which would hold lines back
+                env = dict(os.environ, PYTHONUNBUFFERED='1')
+                proc = subprocess.Popen(command, cwd=cwd, shell=shell, env=env, bufsize=0,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+                for src, dst in ((proc.stdout, sys.stdout), (proc.stderr, sys.stderr)):
+                    pumps.append(threading.Thread(target=pump_output, args=(src, [getattr(dst, 'buffer', dst), log]), daemon=True))
+    except FileNotFoundError:
+        if log is not None:
+            log.close()
+        raise FourError(f"Error with love: Command {command[0]} not found ❤️")
+
+    def forward(signum, frame):
+        try:
+            if os.name == 'nt':
+                # terminate() would only stop cmd.exe when the app runs through the shell
+                subprocess.run(['taskkill', '/T', '/F', '/PID', str(proc.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                proc.send_signal(signum)
+        except (OSError, ValueError):
+            pass
+
+    previous = {}
+    try:
+        # Installed after the spawn so the app does not inherit an ignored SIGINT
+        if threading.current_thread() is threading.main_thread():
+            previous[signal.SIGINT] = signal.signal(signal.SIGINT, signal.SIG_IGN)
+            for signum in FORWARDED_SIGNALS:
+                previous[signum] = signal.signal(signum, forward)
+        with profiler.span('child'):
+            for pump in pumps:
+                pump.start()
+            try:
+                returncode = wait_child(proc)
+            finally:
+                for pump in pumps:
+                    pump.join()
+    finally:
+        for signum, handler in previous.items():
+            signal.signal(signum, handler)
+        if log is not None:
+            log.close()
+    return 128 - returncode if returncode < 0 else returncode
+
+class FourCache:
+    """Extracted .app payloads, kept on disk so repeat launches skip the unzip.
+
+    Entries live in apps/<sha256 of the .app>. refs/ maps an .app file
+    (path, size, mtime) to its payload digest, so a warm launch is a stat
+    and a small read. Entries are populated in a private staging dir and
+    renamed into place, so concurrent launches never see half an app.
+
+    Apps run straight from their entry, so a warm launch is a lease and
+    an exec. Entries are read-only, directories included, so an app cannot
+    change what the next launch runs; apps that write to their own files
+    get a private copy instead (CONFIGURE["writable", "yes"]). Each launch
+    holds a lease, a locked file in leases/, and prune and clear skip
+    leased entries.
+    """
+
+    def __init__(self, root=None, max_size=None):
+        if root is None:
+            root = os.environ.get('FOUR_CACHE_DIR')
+        if root is None:
+            base = os.environ.get('LOCALAPPDATA') or os.environ.get('TEMP', 'C:\\temp')
+            root = os.path.join(base, 'four', 'cache')
+        if max_size is None:
+            max_size = parse_size(os.environ.get('FOUR_CACHE_MAX_SIZE', str(CACHE_MAX_SIZE)))
+        self.root = root
+        self.max_size = max_size
+        self.apps_dir = os.path.join(root, 'apps')
+        self.refs_dir = os.path.join(root, 'refs')
+        self.leases_dir = os.path.join(root, 'leases')
+
+    def _ref_path(self, app_file, st=None):
+        if st is None:
+            st = os.stat(app_file)
+        key = f"{os.path.realpath(app_file)}\0{st.st_size}\0{st.st_mtime_ns}\0{st.st_ino}"
+        return os.path.join(self.refs_dir, hashlib.sha1(key.encode('utf-8')).hexdigest())
+
+    def lookup(self, app_file):
+        """Return the cached directory for app_file, or None on a miss"""
+        ref_path = self._ref_path(app_file)
+        try:
+            with open(ref_path, 'r', encoding='utf-8') as f:
+                digest = f.read().strip()
+        except FileNotFoundError:
+            return None
+        entry = os.path.join(self.apps_dir, digest)
+        if not os.path.isdir(entry):
+            return None
+        self._touch(entry)
+        return entry
+
+    def remember(self, app_file, digest, st):
+        """Map app_file, as it was when stat'ed into st, to digest"""
+        ref_path = self._ref_path(app_file, st)
+        os.makedirs(self.refs_dir, exist_ok=True)
+        tmp_path = f"{ref_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(digest)
+        os.replace(tmp_path, ref_path)
+
+    def populate(self, digest, extract):
+        """Return the entry for digest, calling extract(staging_dir) on a miss"""
+        entry = os.path.join(self.apps_dir, digest)
+        if os.path.isdir(entry):
+            self._touch(entry)
+            return entry
+        os.makedirs(self.apps_dir, exist_ok=True)
+        staging = tempfile.mkdtemp(prefix='tmp-', dir=self.root)
+        try:
+            # zipfile checks every member's CRC as it extracts, and the entry is
+            # read-only from here on, so launches never need to check it again
+            extract(staging)
+            self._freeze(staging)
+            # Before the rename, so the entry never shows up without its info
+            self._write_info(digest, {'size': self._tree_size(staging), 'project': self._read_project(staging)})
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another launch populated the same payload first
+                if not os.path.isdir(entry):
+                    raise
+                remove_tree(staging)
+                return entry
+        except BaseException:
+            remove_tree(staging)
+            raise
+        # Moving a directory to another parent needs write access to it, so the top is frozen last
+        os.chmod(entry, 0o555)
+        self.prune(keep=(digest,))
+        return entry
+
+    @contextlib.contextmanager
+    def lease(self, entry):
+        """Hold entry for one launch, so prune and clear leave it alone.
+
+        Yields the entry, or None when it was evicted meanwhile, so the
+        caller can extract again.
+        """
+        name = f"{os.path.basename(entry)}.{os.getpid()}.{os.urandom(4).hex()}"
+        lease_path = os.path.join(self.leases_dir, name)
+        os.makedirs(self.leases_dir, exist_ok=True)
+        lease_file = None
+        with self._guard():
+            if os.path.isdir(entry):
+                lease_file = open(lease_path, 'wb')
+                lock_file(lease_file)
+        if lease_file is None:
+            yield None
+            return
+        try:
+            yield entry
+        finally:
+            unlock_file(lease_file)
+            lease_file.close()
+            try:
+                os.remove(lease_path)
+            except OSError:
+                pass
+
+    def entries(self):
+        """List cached entries, least recently used first"""
+        result = []
+        try:
+            names = os.listdir(self.apps_dir)
+        except FileNotFoundError:
+            return result
+        for name in names:
+            entry = os.path.join(self.apps_dir, name)
+            if not os.path.isdir(entry):
+                continue
+            info = self._read_info(name)
+            if info is None:
+                info = {'size': self._tree_size(entry), 'project': self._read_project(entry)}
+            try:
+                last_used = os.stat(entry).st_mtime
+            except FileNotFoundError:
+                continue
+            result.append({
+                'digest': name,
+                'path': entry,
+                'size': info.get('size', 0),
+                'project': info.get('project'),
+                'last_used': last_used
+            })
+        result.sort(key=lambda e: e['last_used'])
+        return result
+
+    def prune(self, max_size=None, keep=()):
+        """Evict least recently used entries until the cache fits in max_size"""
+        if max_size is None:
+            max_size = self.max_size
+        return self._evict(lambda total: total > max_size, keep)
+
+    def clear(self):
+        """Remove every entry that no launch is using"""
+        removed = self._evict(lambda total: True)
+        shutil.rmtree(self.refs_dir, ignore_errors=True)
+        self._clean_staging(max_age=0)
+        return removed
+
+    def _evict(self, over, keep=()):
+        entries = self.entries()
+        total = sum(e['size'] for e in entries)
+        removed = []
+        trash = []
+        with self._guard():
+            in_use = self._leased_digests()
+            for e in entries:
+                if not over(total):
+                    break
+                if e['digest'] in keep or e['digest'] in in_use:
+                    continue
+                path = self._remove_entry(e['digest'])
+                if path is None:
+                    continue
+                trash.append(path)
+                total -= e['size']
+                removed.append(e)
+        for path in trash:
+            remove_tree(path)
+        self._clean_refs()
+        self._clean_staging()
+        return removed
+
+    def _remove_entry(self, digest):
+        """Move an entry out of apps/, returning where to delete it from (None if it could not be moved)"""
+        entry = os.path.join(self.apps_dir, digest)
+        # Rename first so a concurrent lookup never finds a half-deleted app
+        trash = os.path.join(self.root, f"tmp-evict-{digest}-{os.getpid()}")
+        try:
+            os.chmod(entry, 0o755)  # Moving a directory to another parent needs write access to it
+            os.rename(entry, trash)
+        except OSError:
+            try:
+                os.chmod(entry, 0o555)
+            except OSError:
+                pass
+            return None
+        try:
+            os.remove(self._info_path(digest))
+        except FileNotFoundError:
+            pass
+        return trash
+
+    @contextlib.contextmanager
+    def _guard(self):
+        """Serialize lease creation against eviction across processes"""
+        os.makedirs(self.root, exist_ok=True)
+        with open(os.path.join(self.root, 'lock'), 'a+b') as f:
+            lock_file(f)
+            try:
+                yield
+            finally:
+                unlock_file(f)
+
+    def _leased_digests(self):
+        """Digests some live launch holds a lease on; leases of dead launches are cleaned up"""
+        try:
+            names = os.listdir(self.leases_dir)
+        except FileNotFoundError:
+            return set()
+        leased = set()
+        for name in names:
+            lease_path = os.path.join(self.leases_dir, name)
+            try:
+                f = open(lease_path, 'rb')
+            except OSError:
+                continue
+            with f:
+                held = not lock_file(f, blocking=False)
+                if not held:
+                    unlock_file(f)
+            if held:
+                leased.add(name.split('.', 1)[0])
+                continue
+            try:
+                os.remove(lease_path)
+            except OSError:
+                pass
+        return leased
+
+    @staticmethod
+    def _freeze(path):
+        """Make everything below path read-only, so apps cannot write into the cache"""
+        for folder_name, dirs, files in os.walk(path):
+            for file in files:
+                os.chmod(os.path.join(folder_name, file), 0o444)
+            for name in dirs:
+                os.chmod(os.path.join(folder_name, name), 0o555)
+
+    def _clean_refs(self):
+        try:
+            names = os.listdir(self.refs_dir)
+        except FileNotFoundError:
+            return
+        for name in names:
+            ref_path = os.path.join(self.refs_dir, name)
+            try:
+                with open(ref_path, 'r', encoding='utf-8') as f:
+                    digest = f.read().strip()
+                if not os.path.isdir(os.path.join(self.apps_dir, digest)):
+                    os.remove(ref_path)
+            except OSError:
+                pass
+
+    def _clean_staging(self, max_age=CACHE_STALE_SECONDS):
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return
+        now = time.time()
+        for name in names:
+            if not name.startswith('tmp-'):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                if now - os.stat(path).st_mtime >= max_age:
+                    remove_tree(path)
+            except FileNotFoundError:
+                pass
+
+    def _touch(self, entry):
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+    def _info_path(self, digest):
+        return os.path.join(self.apps_dir, f"{digest}.json")
+
+    def _read_info(self, digest):
+        try:
+            with open(self._info_path(digest), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_info(self, digest, info):
+        info_path = self._info_path(digest)
+        tmp_path = f"{info_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(info, f)
+        os.replace(tmp_path, info_path)
+
+    @staticmethod
+    def _tree_size(path):
+        total = 0
+        for folder_name, _, files in os.walk(path):
+            for file in files:
+                try:
+                    total += os.lstat(os.path.join(folder_name, file)).st_size
+                except OSError:
+                    pass
+        return total
+
+    @staticmethod
+    def _read_project(path):
+        try:
+            with open(os.path.join(path, 'settings.json'), 'r', encoding='utf-8') as f:
+                return json.load(f).get('project')
+        except (OSError, ValueError):
+            return None
+
 class WindowsConsole:
     """Windows-specific console utilities"""
     
@@ -56,6 +683,64 @@ class WindowsConsole:
         }
         print(f"{colors.get(color, colors['white'])}{text}{colors['reset']}")
 
+class FourProfiler:
+    """Named timing spans for --profile, reported on stderr.
+
+    Spans nest under the one they run in, and a span entered again with the
+    same name adds to it, so per-file work shows up as one line. Without a
+    format nothing is recorded, which is how every command runs by default.
+    """
+
+    FORMATS = ('table', 'json')
+
+    def __init__(self, fmt=None):
+        self.fmt = fmt
+        self.spans = {}
+        self.stack = []
+        self.origin = time.perf_counter()
+
+    @contextlib.contextmanager
+    def span(self, name):
+        """Time a phase; set bytes on the yielded dict to report how much it processed"""
+        call = {'bytes': None}
+        if self.fmt is None:
+            yield call
+            return
+        path = '/'.join(self.stack + [name])
+        record = self.spans.setdefault(path, {'span': path, 'depth': len(self.stack), 'start': None,
+                                              'seconds': 0.0, 'bytes': None, 'count': 0})
+        self.stack.append(name)
+        start = time.perf_counter()
+        try:
+            yield call
+        finally:
+            self.stack.pop()
+            if record['start'] is None:
+                record['start'] = start - self.origin
+            record['seconds'] += time.perf_counter() - start
+            record['count'] += 1
+            if call['bytes'] is not None:
+                record['bytes'] = (record['bytes'] or 0) + call['bytes']
+
+    def report(self, file=None):
+        """Print the recorded spans, as a table or one JSON object per line"""
+        if self.fmt is None or not self.spans:
+            return
+        file = file or sys.stderr
+        if self.fmt == 'json':
+            for record in self.spans.values():
+                print(json.dumps({'span': record['span'], 'start_ms': round(record['start'] * 1000, 3),
+                                  'ms': round(record['seconds'] * 1000, 3), 'bytes': record['bytes'],
+                                  'count': record['count']}), file=file)
+            return
+        rows = [('  ' * record['depth'] + record['span'].rsplit('/', 1)[-1], record) for record in self.spans.values()]
+        width = max(len(label) for label, _ in rows)
+        print("Profile with love:", file=file)
+        for label, record in rows:
+            size = format_size(record['bytes']) if record['bytes'] is not None else ''
+            count = f"x{record['count']}" if record['count'] > 1 else ''
+            print(f"  {label:<{width}}  {record['seconds'] * 1000:10.2f} ms  {size:>10}  {count}".rstrip(), file=file)
+
 class FourInterpreter:
     def __init__(self):
         self.project_name = None
@@ -66,6 +751,7 @@ class FourInterpreter:
             'version': '1.0',
             'author': 'Unknown',
             'description': '',
+            'writable': 'no',
             'icon': None,
             'dependencies': [],
             'build_time': None
@@ -77,6 +763,7 @@ class FourInterpreter:
         self.folders = []
         self.files = []
         self.console = WindowsConsole()
+        self.profiler = FourProfiler()
         
         # Windows-specific paths
         self.windows_paths = {
@@ -110,7 +797,12 @@ class FourInterpreter:
             
         return base_cmd in windows_commands or os.path.exists(base_cmd)
 
-    def parse_line(self, line):
+    def syntax_error(self, message, lineno=None):
+        """FourError pointing at the offending line when it is known"""
+        where = f" (line {lineno})" if lineno else ""
+        return FourError(f"Error with love: {message}{where} ❤️")
+
+    def parse_line(self, line, lineno=None):
         """Parse individual line with Windows-specific enhancements"""
         if self.in_define:
             self.main_code += line + "\n"
@@ -120,176 +812,212 @@ class FourInterpreter:
         if not line or line.startswith('->'):
             return
 
-        if line.startswith('PROJECT'):
-            if self.project_declared:
-                raise FourError("Error with love: PROJECT can only be declared once ❤️")
-            match = re.match(r'PROJECT\s+"([^"]+)"', line)
-            if match:
-                self.project_name = match.group(1)
-                # Sanitize project name for Windows
-                self.project_name = re.sub(r'[<>:"/\\|?*]', '_', self.project_name)
-                self.project_declared = True
-            else:
-                raise FourError("Error with love: Incorrect syntax in PROJECT ❤️")
-
-        elif line.startswith('CONFIGURE'):
-            match = re.match(r'CONFIGURE\["([^"]+)",\s*"([^"]+)"\]', line)
-            if match:
-                key, value = match.groups()
-                if key == 'readme' and value in self.exports:
-                    self.config[key] = self.exports[value]
-                elif key == 'run':
-                    # Validate Windows compatibility
-                    if not self.validate_windows_compatibility(value):
-                        self.console.print_colored(f"Warning: Command '{value}' might not be Windows-compatible", 'yellow')
-                    self.config[key] = value
-                else:
-                    self.config[key] = value
-            else:
-                raise FourError("Error with love: Incorrect syntax in CONFIGURE ❤️")
-
-        elif line.startswith('EXPORT'):
-            self._parse_export(line)
-
-        elif line.startswith('FOLDER'):
-            match = re.match(r'FOLDER\s+"([^"]+)"', line)
-            if match:
-                folder_name = match.group(1)
-                # Convert to Windows path format
-                folder_name = folder_name.replace('/', '\\')
-                self.folders.append(folder_name)
-            else:
-                raise FourError("Error with love: Incorrect syntax in FOLDER ❤️")
+        for keyword, handler in self.DIRECTIVES:
+            if line.startswith(keyword):
+                handler(self, line, lineno)
+                return
 
-        elif line.startswith('FILE'):
-            match = re.match(r'FILE\s+"([^"]+)"\s+"([^"]+)"', line)
-            if match:
-                src, dest = match.groups()
-                # Convert to Windows path format
-                src = src.replace('/', '\\')
-                dest = dest.replace('/', '\\')
-                self.files.append((src, dest))
-            else:
-                raise FourError("Error with love: Incorrect syntax in FILE ❤️")
+    def _parse_project(self, line, lineno):
+        """Parse PROJECT, sanitizing the name for Windows"""
+        if self.project_declared:
+            raise self.syntax_error("PROJECT can only be declared once", lineno)
+        match = PROJECT_RE.match(line)
+        if match:
+            self.project_name = match.group(1)
+            # Sanitize project name for Windows
+            self.project_name = WINDOWS_RESERVED_RE.sub('_', self.project_name)
+            self.project_declared = True
+        else:
+            raise self.syntax_error("Incorrect syntax in PROJECT", lineno)
 
-        elif line.startswith('DEFINE'):
-            match = re.match(r'DEFINE\s+(\w+)', line)
-            if match:
-                self.in_define = True
+    def _parse_configure(self, line, lineno):
+        """Parse CONFIGURE, warning about commands Windows may not have"""
+        match = CONFIGURE_RE.match(line)
+        if match:
+            key, value = match.groups()
+            if key == 'readme' and value in self.exports:
+                self.config[key] = self.exports[value]
+            elif key == 'run':
+                # Validate Windows compatibility
+                if not self.validate_windows_compatibility(value):
+                    self.console.print_colored(f"Warning: Command '{value}' might not be Windows-compatible", 'yellow')
+                self.config[key] = value
             else:
-                raise FourError("Error with love: Incorrect syntax in DEFINE ❤️")
+                self.config[key] = value
+        else:
+            raise self.syntax_error("Incorrect syntax in CONFIGURE", lineno)
 
-    def _parse_export(self, line):
+    def _parse_export(self, line, lineno=None):
         """Parse EXPORT statements with enhanced type support"""
         if 'string[' in line:
-            match = re.match(r'EXPORT\s+(\w+)\["([^"]+)"\]', line)
+            match = EXPORT_STRING_RE.match(line)
             if match:
                 var_name, value = match.groups()
                 self.exports[var_name] = value
             else:
-                raise FourError("Error with love: Incorrect syntax in EXPORT string ❤️")
+                raise self.syntax_error("Incorrect syntax in EXPORT string", lineno)
         elif 'numero[' in line:
-            match = re.match(r'EXPORT\s+(\w+)\[(\d+)\]', line)
+            match = EXPORT_NUMERO_RE.match(line)
             if match:
                 var_name, value = match.groups()
                 self.exports[var_name] = int(value)
             else:
-                raise FourError("Error with love: Incorrect syntax in EXPORT numero ❤️")
+                raise self.syntax_error("Incorrect syntax in EXPORT numero", lineno)
         elif 'float[' in line:
-            match = re.match(r'EXPORT\s+(\w+)\[(\d+\.?\d*)\]', line)
+            match = EXPORT_FLOAT_RE.match(line)
             if match:
                 var_name, value = match.groups()
                 self.exports[var_name] = float(value)
             else:
-                raise FourError("Error with love: Incorrect syntax in EXPORT float ❤️")
+                raise self.syntax_error("Incorrect syntax in EXPORT float", lineno)
         elif 'bool[' in line:
-            match = re.match(r'EXPORT\s+(\w+)\[(true|false)\]', line)
+            match = EXPORT_BOOL_RE.match(line)
             if match:
                 var_name, value = match.groups()
                 self.exports[var_name] = value.lower() == 'true'
             else:
-                raise FourError("Error with love: Incorrect syntax in EXPORT bool ❤️")
+                raise self.syntax_error("Incorrect syntax in EXPORT bool", lineno)
         else:
-            match = re.match(r'EXPORT\s+(\w+)\["', line)
+            match = EXPORT_OPEN_RE.match(line)
             if match:
                 var_name = match.group(1)
                 self.exports[var_name] = ""
 
+    def _parse_folder(self, line, lineno):
+        """Parse FOLDER into a Windows path"""
+        match = FOLDER_RE.match(line)
+        if match:
+            folder_name = match.group(1)
+            # Convert to Windows path format
+            folder_name = folder_name.replace('/', '\\')
+            self.folders.append(folder_name)
+        else:
+            raise self.syntax_error("Incorrect syntax in FOLDER", lineno)
+
+    def _parse_file(self, line, lineno):
+        """Parse FILE into Windows source and destination paths"""
+        match = FILE_RE.match(line)
+        if match:
+            src, dest = match.groups()
+            # Convert to Windows path format
+            src = src.replace('/', '\\')
+            dest = dest.replace('/', '\\')
+            self.files.append((src, dest))
+        else:
+            raise self.syntax_error("Incorrect syntax in FILE", lineno)
+
+    def _parse_define(self, line, lineno):
+        """Parse DEFINE, after which every line is code"""
+        match = DEFINE_RE.match(line)
+        if match:
+            self.in_define = True
+        else:
+            raise self.syntax_error("Incorrect syntax in DEFINE", lineno)
+
+    # Checked in order, like the original if/elif chain
+    DIRECTIVES = (
+        ('PROJECT', _parse_project),
+        ('CONFIGURE', _parse_configure),
+        ('EXPORT', _parse_export),
+        ('FOLDER', _parse_folder),
+        ('FILE', _parse_file),
+        ('DEFINE', _parse_define),
+    )
+
     def parse_multiline_export(self, lines, start_idx):
         """Parse multiline EXPORT with Windows line endings support"""
         line = lines[start_idx].strip()
-        match = re.match(r'EXPORT\s+(\w+)\["', line)
+        match = EXPORT_OPEN_RE.match(line)
         if not match:
-            return start_idx
+            raise self.syntax_error("Incorrect syntax in EXPORT", start_idx + 1)
 
         var_name = match.group(1)
-        content = ""
-        i = start_idx
         first_line_content = line[line.find('["') + 2:]
         
         if first_line_content.endswith('"]'):
-            content = first_line_content[:-2]
-            self.exports[var_name] = content
-            return i + 1
-            
-        content = first_line_content + "\n"
-        i += 1
+            self.exports[var_name] = first_line_content[:-2]
+            return start_idx + 1
+        
+        # Collect the lines and join once, so long exports stay linear
+        parts = [first_line_content]
+        i = start_idx + 1
         
         while i < len(lines):
             current_line = lines[i].rstrip('\r\n')  # Handle Windows line endings
             if current_line.endswith('"]'):
-                content += current_line[:-2]
+                parts.append(current_line[:-2])
                 break
-            else:
-                content += current_line + "\n"
+            parts.append(current_line)
             i += 1
+        else:
+            parts.append('')  # Never closed: keeps the trailing newline
             
-        self.exports[var_name] = content
+        self.exports[var_name] = "\n".join(parts)
         return i + 1
 
+    def read_source(self, filename):
+        """Read a .four file once, detect its encoding and split it into lines"""
+        with self.profiler.span('read') as span:
+            with open(filename, 'rb') as f:
+                data = f.read()
+            span['bytes'] = len(data)
+        
+        # Try different encodings for Windows compatibility, on the bytes already read
+        with self.profiler.span('decode') as span:
+            span['bytes'] = len(data)
+            if data.startswith(codecs.BOM_UTF8):
+                text = data[len(codecs.BOM_UTF8):].decode('utf-8')
+            else:
+                text = None
+                for encoding in ('utf-8', 'cp1252', 'iso-8859-1'):
+                    try:
+                        text = data.decode(encoding)
+                        break
+                    except UnicodeDecodeError:
+                        continue
+                if text is None:
+                    raise FourError(f"Error with love: Could not decode file {filename} ❤️")
+            
+            lines = text.replace('\r\n', '\n').replace('\r', '\n').split('\n')
+        if lines[-1] == '':
+            lines.pop()
+        return lines
+
     def parse_file(self, filename):
         """Parse .four file with enhanced error handling"""
-        try:
-            # Try different encodings for Windows compatibility
-            encodings = ['utf-8', 'utf-8-sig', 'cp1252', 'iso-8859-1']
-            content = None
-            
-            for encoding in encodings:
-                try:
-                    with open(filename, 'r', encoding=encoding) as f:
-                        content = f.readlines()
-                    break
-                except UnicodeDecodeError:
-                    continue
-                    
-            if content is None:
-                raise FourError(f"Error with love: Could not decode file {filename} ❤️")
-                
-            lines = content
-            i = 0
+        with self.profiler.span('parse'):
+            try:
+                lines = self.read_source(filename)
+                with self.profiler.span('directives'):
+                    i = 0
             
-            while i < len(lines):
-                original_line = lines[i].rstrip('\n\r')
-                line = original_line.strip()
+                    while i < len(lines):
+                        line = lines[i].strip()
                 
-                if not self.in_define and (not line or line.startswith('->')):
-                    i += 1
-                    continue
-                    
-                if not self.in_define and line.startswith('EXPORT') and '["' in line and not (line.count('"') >= 2 and line.endswith('"]')):
-                    i = self.parse_multiline_export(lines, i)
-                    continue
+                        if not line or line.startswith('->'):
+                            i += 1
+                            continue
                     
-                if self.in_define:
-                    self.parse_line(original_line)
-                else:
-                    self.parse_line(line)
-                i += 1
+                        if line.startswith('EXPORT') and '["' in line and not (line.count('"') >= 2 and line.endswith('"]')):
+                            i = self.parse_multiline_export(lines, i)
+                            continue
                 
-        except FileNotFoundError:
-            raise FourError(f"Error with love: File {filename} not found ❤️")
-        except Exception as e:
-            raise FourError(f"Error with love: {str(e)} ❤️")
+                        self.parse_line(line, i + 1)
+                        i += 1
+                
+                        if self.in_define:
+                            # Everything after DEFINE is the program, taken as one span
+                            body = lines[i:]
+                            if body:
+                                self.main_code += "\n".join(body) + "\n"
+                            break
+
+            except FileNotFoundError:
+                raise FourError(f"Error with love: File {filename} not found ❤️")
+            except FourError:
+                raise
+            except Exception as e:
+                raise FourError(f"Error with love: {str(e)} ❤️")
 
     def validate(self):
         """Validate project configuration with Windows-specific checks"""
@@ -305,27 +1033,170 @@ class FourInterpreter:
         valid_platforms = ['linux', 'windows', 'windows-10', 'windows-11', 'all']
         if self.config['platform'] not in valid_platforms:
             raise FourError(f"Error with love: Platform '{self.config['platform']}' is not valid. Use: {', '.join(valid_platforms)} ❤️")
+        if self.config['writable'] not in ('yes', 'no'):
+            raise FourError(f"Error with love: 'writable' can be yes or no, not '{self.config['writable']}' ❤️")
 
-    def create_windows_executable_wrapper(self, temp_dir):
-        """Create a Windows batch file wrapper"""
-        wrapper_content = f"""@echo off
+    def windows_wrapper_content(self):
+        """Content of the Windows batch file wrapper"""
+        return f"""@echo off
 cd /d "%~dp0"
 {self.config['run']} code.four-code
 pause
 """
-        wrapper_path = os.path.join(temp_dir, 'run.bat')
-        with open(wrapper_path, 'w', encoding='utf-8') as f:
-            f.write(wrapper_content)
-        return 'run.bat'
 
-    def build(self, output_file):
+    def entry_info(self, arcname):
+        """ZipInfo for an entry generated by the build"""
+        zinfo = zipfile.ZipInfo(arcname, GENERATED_DATE_TIME)
+        if arcname.endswith('/'):
+            zinfo.external_attr = 0o40755 << 16 | 0x10  # Directory
+        else:
+            zinfo.external_attr = 0o644 << 16
+            zinfo.compress_type = zipfile.ZIP_DEFLATED
+        return zinfo
+
+    def file_entries(self):
+        """Map archive names to FILE sources, later declarations winning"""
+        entries = {}
+        for src, dest in self.files:
+            if not os.path.exists(src):
+                self.console.print_colored(f"Warning: Source file not found: {src}", 'yellow')
+                continue
+            arcname = os.path.normpath(dest).replace('\\', '/').lstrip('/')
+            if arcname in ('settings.json', 'code.four-code', 'run.bat', MANIFEST_NAME):
+                continue
+            entries[arcname] = src
+        return entries
+
+    def build_manifest(self, settings_data, generated, files, known_sources):
+        """Hash every archive entry, trusting known hashes for untouched sources.
+
+        Returns the manifest, which holds content hashes only since it ships
+        inside the .app, and the source stats to keep next to the output.
+        """
+        entries = {}
+        sources = {}
+        for arcname, content in generated.items():
+            entries[arcname] = {'sha256': hashlib.sha256(content.encode('utf-8')).hexdigest()}
+        for arcname, src in files.items():
+            st = os.stat(src)
+            source = {'path': os.path.abspath(src), 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+            known = known_sources.get(arcname, {})
+            digest = known.get('sha256')
+            if not digest or any(known.get(k) != v for k, v in source.items()):
+                digest = file_sha256(src)
+            entries[arcname] = {'sha256': digest}
+            sources[arcname] = dict(source, sha256=digest)
+        
+        # build_time changes on every build, so it never makes a build stale
+        stable_settings = {k: v for k, v in settings_data.items() if k != 'build_time'}
+        settings_json = json.dumps(stable_settings, sort_keys=True, ensure_ascii=False)
+        return {
+            'version': MANIFEST_VERSION,
+            'settings': hashlib.sha256(settings_json.encode('utf-8')).hexdigest(),
+            'entries': entries
+        }, sources
+
+    @staticmethod
+    def manifest_hashes(manifest):
+        """Settings hash and per-entry content hashes of a manifest"""
+        return manifest['settings'], {name: entry['sha256'] for name, entry in manifest['entries'].items()}
+
+    def reusable_entries(self, previous, manifest, old_zip):
+        """Entries whose compressed bytes can be copied from the previous build"""
+        if previous is None:
+            return set()
+        old_hashes = self.manifest_hashes(previous)[1]
+        return {name for name, entry in manifest['entries'].items()
+                if old_hashes.get(name) == entry['sha256'] and name in old_zip.NameToInfo}
+
+    @staticmethod
+    def sources_file(app_file):
+        """Where the source stats of app_file live"""
+        directory, name = os.path.split(os.path.abspath(app_file))
+        return os.path.join(directory, f".{name}.four-sources.json")
+
+    def read_sources(self, app_file):
+        """Source stats and hashes of the last build, kept beside the output and never shipped"""
+        try:
+            with open(self.sources_file(app_file), 'r', encoding='utf-8') as f:
+                sources = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(sources, dict) or not all(isinstance(v, dict) for v in sources.values()):
+            return {}
+        return sources
+
+    def write_sources(self, app_file, sources):
+        """Remember source stats so the next build only hashes files that changed"""
+        try:
+            with atomic_output(self.sources_file(app_file)) as f:
+                f.write(json.dumps(sources, indent=2, ensure_ascii=False).encode('utf-8'))
+        except OSError:
+            pass  # Only a shortcut: the next build hashes every file again
+
+    def read_manifest(self, app_file):
+        """Load the build manifest of an existing .app, if it has one"""
+        try:
+            with self.open_app(app_file) as zipf:
+                manifest = json.loads(zipf.read(MANIFEST_NAME).decode('utf-8'))
+        except (OSError, FourError, zipfile.BadZipFile, KeyError, ValueError):
+            return None
+        if manifest.get('version') != MANIFEST_VERSION:
+            return None
+        return manifest
+
+    def compress_type_for(self, arcname):
+        """Store already compressed formats, deflate everything else"""
+        if os.path.splitext(arcname)[1].lower() in STORED_EXTENSIONS:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def pack_files(self, stack, files, spool_dir, jobs):
+        """Start packing files and return packed(zipf, arcname), which appends one.
+
+        With more than one job, deflated files are compressed ahead of time
+        by a process pool into spool files next to the output. Stored files
+        and serial builds stream from the source straight into the archive.
+        """
+        deflated = [name for name in files if self.compress_type_for(name) == zipfile.ZIP_DEFLATED]
+        futures = {}
+        spool_paths = {}
+        if jobs > 1 and len(deflated) > 1:
+            spool = stack.enter_context(tempfile.TemporaryDirectory(prefix='.four-spool-', dir=spool_dir))
+            pool = stack.enter_context(ProcessPoolExecutor(max_workers=jobs))
+            for i, arcname in enumerate(deflated):
+                spool_paths[arcname] = os.path.join(spool, str(i))
+                futures[arcname] = pool.submit(pack_file_to_spool, files[arcname], spool_paths[arcname],
+                                               zipfile.ZIP_DEFLATED, COMPRESS_LEVEL)
+
+        def packed(zipf, arcname):
+            # Same date and mode as generated entries, so the .app never depends on source stats
+            zinfo = self.entry_info(arcname)
+            zinfo.compress_type = self.compress_type_for(arcname)
+            if arcname not in futures:
+                zinfo.CRC = zinfo.compress_size = 0  # Filled in once packed
+
+                def write_data(dst):
+                    zinfo.CRC, zinfo.file_size, zinfo.compress_size = pack_file(
+                        files[arcname], dst, zinfo.compress_type, COMPRESS_LEVEL)
+                write_raw_member(zipf, zinfo, write_data)
+                return
+            zinfo.CRC, zinfo.file_size, zinfo.compress_size = futures[arcname].result()
+            with open(spool_paths[arcname], 'rb') as src:
+                write_raw_member(zipf, zinfo, lambda dst: copy_bytes(src, dst, zinfo.compress_size))
+            os.remove(spool_paths[arcname])
+
+        return packed
+
+    def build(self, output_file, force=False, jobs=1):
         """Build project with Windows-specific enhancements"""
-        self.validate()
+        with self.profiler.span('build'):
+            with self.profiler.span('validate'):
+                self.validate()
         
-        self.console.print_colored("Building Binary with love.. ❤️", 'cyan')
-        start_time = time.time()
+            self.console.print_colored("Building Binary with love.. ❤️", 'cyan')
+            start_time = time.time()
         
-        with tempfile.TemporaryDirectory(dir=self.windows_paths['temp']) as temp_dir:
             # Enhanced settings
             settings_data = {
                 'project': self.project_name,
@@ -335,147 +1206,219 @@ pause
                 'version': self.config['version'],
                 'author': self.config.get('author', 'Unknown'),
                 'description': self.config.get('description', ''),
+                'writable': self.config['writable'],
                 'build_time': datetime.now().isoformat(),
                 'build_platform': self.get_current_platform(),
                 'checksum': None  # Will be calculated later
             }
-            
-            # Create settings.json
-            settings_file = os.path.join(temp_dir, 'settings.json')
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings_data, f, indent=2, ensure_ascii=False)
-            
-            # Create code file
-            code_file = os.path.join(temp_dir, 'code.four-code')
-            with open(code_file, 'w', encoding='utf-8') as f:
-                f.write(self.main_code)
-            
+            generated = {'code.four-code': self.main_code}
+        
             # Create Windows wrapper if needed
             if platform.system() == 'Windows' and self.config['platform'].startswith('windows'):
-                wrapper_file = self.create_windows_executable_wrapper(temp_dir)
-                settings_data['wrapper'] = wrapper_file
-            
-            # Copy folders and files
+                generated['run.bat'] = self.windows_wrapper_content()
+                settings_data['wrapper'] = 'run.bat'
+        
+            # Folders become directory entries
             for folder in self.folders:
-                folder_path = os.path.join(temp_dir, folder)
-                os.makedirs(folder_path, exist_ok=True)
-                self.console.print_colored(f"Created folder: {folder}", 'green')
-            
-            for src, dest in self.files:
-                if os.path.exists(src):
-                    dest_path = os.path.join(temp_dir, dest)
-                    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-                    shutil.copy2(src, dest_path)
-                    self.console.print_colored(f"Copied: {src} -> {dest}", 'green')
-                else:
-                    self.console.print_colored(f"Warning: Source file not found: {src}", 'yellow')
-            
+                generated[os.path.normpath(folder).replace('\\', '/').strip('/') + '/'] = ''
+        
             # Calculate checksum
             checksum = hashlib.md5()
             checksum.update(self.main_code.encode('utf-8'))
             settings_data['checksum'] = checksum.hexdigest()
-            
-            # Update settings with checksum
-            with open(settings_file, 'w', encoding='utf-8') as f:
-                json.dump(settings_data, f, indent=2, ensure_ascii=False)
-            
-            # Create .app file
-            with open(output_file, 'wb') as app_file:
-                app_file.write(b'LOVE-APP-WIN')  # Windows-specific header
-                
-                import io
-                zip_buffer = io.BytesIO()
-                with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
-                    # Add all files from temp directory
-                    for root, dirs, files in os.walk(temp_dir):
-                        for file in files:
-                            full_path = os.path.join(root, file)
-                            rel_path = os.path.relpath(full_path, temp_dir)
-                            zipf.write(full_path, rel_path)
-                
-                zip_buffer.seek(0)
-                app_file.write(zip_buffer.read())
         
-        build_time = time.time() - start_time
-        self.console.print_colored(f"Done! Built in {build_time:.2f} seconds ❤️", 'green')
-        self.console.print_colored(f"Output: {output_file}", 'magenta')
+            # Skip the build when nothing changed since the last one
+            files = self.file_entries()
+            with self.profiler.span('manifest'):
+                previous = None if force else self.read_manifest(output_file)
+                known_sources = {} if force else self.read_sources(output_file)
+                manifest, sources = self.build_manifest(settings_data, generated, files, known_sources)
+            if previous is not None and self.manifest_hashes(previous) == self.manifest_hashes(manifest):
+                if sources != known_sources:
+                    # Touched but unchanged files: note their new stats so they are not hashed again
+                    self.write_sources(output_file, sources)
+                self.console.print_colored("Up to date! Nothing changed since the last build ❤️", 'green')
+                self.console.print_colored(f"Output: {output_file}", 'magenta')
+                return False
+        
+            # Stream every entry straight into the .app, copying unchanged ones from the last build
+            with self.profiler.span('write') as write_span:
+                with atomic_output(output_file) as app_file:
+                    # Closed before atomic_output replaces the old .app, which Windows refuses while it is open
+                    with contextlib.ExitStack() as stack:
+                        old_zip = stack.enter_context(self.open_app(output_file)) if previous else None
+                        reuse = self.reusable_entries(previous, manifest, old_zip)
+                        packed = self.pack_files(stack, {name: src for name, src in files.items() if name not in reuse},
+                                                 os.path.dirname(os.path.abspath(output_file)), jobs)
+                        app_file.write(b'LOVE-APP-WIN')  # Windows-specific header
+                        with zipfile.ZipFile(app_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=9) as zipf:
+                            zipf.writestr(self.entry_info('settings.json'), json.dumps(settings_data, indent=2, ensure_ascii=False))
+                            for arcname in manifest['entries']:
+                                if arcname in reuse:
+                                    with self.profiler.span('reuse') as span:
+                                        info = old_zip.getinfo(arcname)
+                                        copy_member(old_zip, info, zipf, self.entry_info(arcname))
+                                        span['bytes'] = info.compress_size
+                                    if not arcname.endswith('/'):
+                                        self.console.print_colored(f"Reused: {arcname}", 'green')
+                                elif arcname in generated:
+                                    zipf.writestr(self.entry_info(arcname), generated[arcname])
+                                    if arcname.endswith('/'):
+                                        self.console.print_colored(f"Created folder: {arcname[:-1]}", 'green')
+                                else:
+                                    with self.profiler.span('compress') as span:
+                                        packed(zipf, arcname)
+                                        span['bytes'] = zipf.getinfo(arcname).file_size
+                                    self.console.print_colored(f"Copied: {files[arcname]} -> {arcname}", 'green')
+                            zipf.writestr(self.entry_info(MANIFEST_NAME), json.dumps(manifest, indent=2, ensure_ascii=False))
+                    write_span['bytes'] = app_file.tell()
+        
+            self.write_sources(output_file, sources)
+            build_time = time.time() - start_time
+            self.console.print_colored(f"Done! Built in {build_time:.2f} seconds ❤️", 'green')
+            self.console.print_colored(f"Output: {output_file}", 'magenta')
+            return True
 
-    def run_app(self, app_file):
-        """Run application with Windows-specific enhancements"""
-        try:
-            self.console.print_colored(f"Running {app_file} with love.. ❤️", 'cyan')
-            
-            with open(app_file, 'rb') as f:
+    @contextlib.contextmanager
+    def open_app(self, app_file):
+        """Open the ZIP payload in place, right after the .app header"""
+        with open(app_file, 'rb') as f:
+            with self.profiler.span('open') as span:
                 header = f.read(12)  # Read longer header
                 if not (header.startswith(b'LOVE-APP') or header.startswith(b'LOVE-APP-WIN')):
                     raise FourError("Error with love: Invalid .app file (incorrect header) ❤️")
                 
-                # Adjust for different header lengths
-                if header.startswith(b'LOVE-APP-WIN'):
-                    f.seek(12)
-                else:
-                    f.seek(8)
-                
-                zip_content = f.read()
+                # zipfile finds the central directory from the end of the file and
+                # corrects member offsets for either header length, so nothing is
+                # copied out of the .app
+                zipf = zipfile.ZipFile(f, 'r')
+                span['bytes'] = os.fstat(f.fileno()).st_size
+            with zipf:
+                yield zipf
+
+    def payload_digest(self, zipf):
+        """SHA-256 of the whole .app, read through the handle the archive was opened from"""
+        return stream_sha256(zipf.fp)
+
+    def extract_members(self, zipf, dest_dir):
+        """Extract what the app needs to run, leaving out the build manifest"""
+        members = [info for info in zipf.infolist() if info.filename != MANIFEST_NAME]
+        with self.profiler.span('extract') as span:
+            zipf.extractall(dest_dir, members)
+            span['bytes'] = sum(info.file_size for info in members)
+
+    def read_settings(self, zipf):
+        """Parse settings.json straight from the archive"""
+        return json.loads(zipf.read('settings.json').decode('utf-8'))
+
+    def check_platform(self, settings):
+        """Platform compatibility check"""
+        app_platform = settings.get('platform', 'all')
+        current_platform = self.get_current_platform()
+        
+        if app_platform != 'all' and not app_platform.startswith('windows') and current_platform.startswith('windows'):
+            if app_platform != current_platform:
+                raise FourError(f"Error with love: This application is for {app_platform}, but you're on {current_platform} ❤️")
+
+    def extract_cached(self, app_file, zipf, cache):
+        """Return the cached app dir, populating the cache on a miss"""
+        try:
+            with self.profiler.span('hash') as span:
+                st = os.fstat(zipf.fp.fileno())
+                digest = self.payload_digest(zipf)
+                span['bytes'] = st.st_size
+            app_dir = cache.populate(digest, lambda staging: self.extract_members(zipf, staging))
+            cache.remember(app_file, digest, st)
+        except OSError:
+            # Unwritable or contended cache: fall back to a private extraction
+            return None
+        return app_dir
+
+    def lease_cached(self, stack, cache, entry):
+        """Lease a cache entry until stack closes, returning it, or None if it is gone"""
+        with self.profiler.span('lease'):
+            try:
+                return stack.enter_context(cache.lease(entry))
+            except OSError:
+                return None
+
+    def load_settings(self, app_dir):
+        """Read and check the settings of an extracted application"""
+        with self.profiler.span('settings'):
+            with open(os.path.join(app_dir, 'settings.json'), 'r', encoding='utf-8') as f:
+                settings = json.load(f)
+        with self.profiler.span('platform'):
+            self.check_platform(settings)
+        return settings
+
+    def working_dir(self, stack, entry, settings):
+        """Where a cached application runs: its read-only entry, or a private copy if it writes to its files"""
+        if settings.get('writable') != 'yes':
+            return entry
+        app_dir = stack.enter_context(tempfile.TemporaryDirectory(dir=self.windows_paths['temp']))
+        with self.profiler.span('copy'):
+            clone_tree(entry, app_dir)
+        return app_dir
+
+    def launch(self, app_dir, settings, log_file=None):
+        """Execute an extracted application"""
+        # Show app info
+        self.console.print_colored(f"Project: {settings.get('project', 'Unknown')}", 'blue')
+        self.console.print_colored(f"Version: {settings.get('version', '1.0')}", 'blue')
+        if settings.get('author'):
+            self.console.print_colored(f"Author: {settings['author']}", 'blue')
+        print()
+        
+        # Run the application
+        run_command = settings['run'].split()
+        
+        # Use wrapper if available
+        if 'wrapper' in settings and os.path.exists(os.path.join(app_dir, settings['wrapper'])):
+            if platform.system() == 'Windows':
+                return run_child([settings['wrapper']], app_dir, log_file, shell=True, profiler=self.profiler)
+        
+        # Standard execution, output streams through as the app writes it
+        run_command.append('code.four-code')
+        return run_child(run_command, app_dir, log_file, shell=platform.system() == 'Windows', profiler=self.profiler)
+
+    def run_app(self, app_file, cache=None, log_file=None):
+        """Run application with Windows-specific enhancements"""
+        try:
+            self.console.print_colored(f"Running {app_file} with love.. ❤️", 'cyan')
             
-            with tempfile.TemporaryDirectory(dir=self.windows_paths['temp']) as temp_dir:
-                zip_path = os.path.join(temp_dir, 'temp.zip')
-                with open(zip_path, 'wb') as zip_file:
-                    zip_file.write(zip_content)
-                
-                with zipfile.ZipFile(zip_path, 'r') as zipf:
-                    zipf.extractall(temp_dir)
-                
-                # Load settings
-                settings_file = os.path.join(temp_dir, 'settings.json')
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
-                
-                # Platform compatibility check
-                app_platform = settings.get('platform', 'all')
-                current_platform = self.get_current_platform()
-                
-                if app_platform != 'all' and not app_platform.startswith('windows') and current_platform.startswith('windows'):
-                    if app_platform != current_platform:
-                        raise FourError(f"Error with love: This application is for {app_platform}, but you're on {current_platform} ❤️")
-                
-                # Show app info
-                self.console.print_colored(f"Project: {settings.get('project', 'Unknown')}", 'blue')
-                self.console.print_colored(f"Version: {settings.get('version', '1.0')}", 'blue')
-                if settings.get('author'):
-                    self.console.print_colored(f"Author: {settings['author']}", 'blue')
-                print()
+            with self.profiler.span('run'), contextlib.ExitStack() as stack:
+                # Warm launches run the extracted copy in the cache, leased
+                # so no prune removes it meanwhile
+                if cache is not None:
+                    with self.profiler.span('lookup'):
+                        try:
+                            entry = cache.lookup(app_file)
+                        except OSError:
+                            entry = None
+                    entry = self.lease_cached(stack, cache, entry) if entry is not None else None
+                    if entry is not None:
+                        settings = self.load_settings(entry)
+                        return self.launch(self.working_dir(stack, entry, settings), settings, log_file)
                 
-                # Run the application
-                run_command = settings['run'].split()
-                
-                # Use wrapper if available
-                if 'wrapper' in settings and os.path.exists(os.path.join(temp_dir, settings['wrapper'])):
-                    if platform.system() == 'Windows':
-                        result = subprocess.run([settings['wrapper']], 
-                                              capture_output=False, 
-                                              cwd=temp_dir,
-                                              shell=True)
-                        return result.returncode
-                
-                # Standard execution
-                run_command.append('code.four-code')
-                result = subprocess.run(run_command, 
-                                      capture_output=True, 
-                                      text=True, 
-                                      cwd=temp_dir,
-                                      shell=True if platform.system() == 'Windows' else False)
-                
-                if result.stdout:
-                    print(result.stdout, end='')
-                if result.stderr:
-                    print(result.stderr, end='', file=sys.stderr)
-                
-                return result.returncode
+                with self.open_app(app_file) as zipf:
+                    with self.profiler.span('settings'):
+                        settings = self.read_settings(zipf)
+                    with self.profiler.span('platform'):
+                        self.check_platform(settings)
+                    app_dir = None
+                    if cache is not None:
+                        entry = self.extract_cached(app_file, zipf, cache)
+                        entry = self.lease_cached(stack, cache, entry) if entry is not None else None
+                        if entry is not None:
+                            app_dir = self.working_dir(stack, entry, settings)
+                    if app_dir is None:
+                        app_dir = stack.enter_context(tempfile.TemporaryDirectory(dir=self.windows_paths['temp']))
+                        self.extract_members(zipf, app_dir)
+                return self.launch(app_dir, settings, log_file)
                 
         except FileNotFoundError:
             raise FourError(f"Error with love: File {app_file} not found ❤️")
-        except zipfile.BadZipFile:
+        except (zipfile.BadZipFile, KeyError):
             raise FourError("Error with love: Corrupted .app file ❤️")
         except json.JSONDecodeError:
             raise FourError("Error with love: Corrupted .app configuration ❤️")
@@ -483,29 +1426,8 @@ pause
     def show_info(self, app_file):
         """Show detailed information about a .app file"""
         try:
-            with open(app_file, 'rb') as f:
-                header = f.read(12)
-                if not (header.startswith(b'LOVE-APP') or header.startswith(b'LOVE-APP-WIN')):
-                    raise FourError("Error with love: Invalid .app file ❤️")
-                
-                if header.startswith(b'LOVE-APP-WIN'):
-                    f.seek(12)
-                else:
-                    f.seek(8)
-                
-                zip_content = f.read()
-            
-            with tempfile.TemporaryDirectory() as temp_dir:
-                zip_path = os.path.join(temp_dir, 'temp.zip')
-                with open(zip_path, 'wb') as zip_file:
-                    zip_file.write(zip_content)
-                
-                with zipfile.ZipFile(zip_path, 'r') as zipf:
-                    zipf.extractall(temp_dir)
-                
-                settings_file = os.path.join(temp_dir, 'settings.json')
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    settings = json.load(f)
+            with self.open_app(app_file) as zipf:
+                settings = self.read_settings(zipf)
                 
                 # Display information
                 self.console.print_colored("═" * 50, 'cyan')
@@ -530,28 +1452,156 @@ pause
                 
                 # Show contents
                 print("\nContents:")
-                with zipfile.ZipFile(zip_path, 'r') as zipf:
-                    for file_info in zipf.filelist:
-                        size = file_info.file_size
-                        print(f"  {file_info.filename} ({size} bytes)")
+                for file_info in zipf.infolist():
+                    size = file_info.file_size
+                    print(f"  {file_info.filename} ({size} bytes)")
                 
         except Exception as e:
             raise FourError(f"Error with love: {str(e)} ❤️")
 
+def find_four_files(patterns):
+    """Expand files, globs and directories into .four files, in a stable order.
+
+    Also returns the globs and directories that matched nothing, so a typo
+    fails the build instead of quietly building nothing.
+    """
+    four_files = []
+    unmatched = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(glob.glob(os.path.join(glob.escape(pattern), '**', '*.four'), recursive=True))
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        if not matches:
+            unmatched.append(pattern)
+        for match in matches:
+            key = os.path.realpath(match)
+            if key not in seen:
+                seen.add(key)
+                four_files.append(match)
+    return four_files, unmatched
+
+def build_project(interpreter, app_file, force):
+    """Worker entry point for batch builds; never raises"""
+    log = io.StringIO()
+    start = time.perf_counter()
+    result = {'built': False, 'error': None}
+    try:
+        with contextlib.redirect_stdout(log):
+            result['built'] = interpreter.build(app_file, force=force)
+    except FourError as e:
+        result['error'] = str(e)
+    except Exception as e:
+        result['error'] = f"Unexpected error with love: {str(e)} ❤️"
+    result['seconds'] = time.perf_counter() - start
+    result['log'] = log.getvalue()
+    return result
+
+def build_batch(patterns, force=False, jobs=None):
+    """Build many projects on a pool of worker processes; returns the exit code"""
+    start = time.perf_counter()
+    failed = 0
+    projects = []
+    outputs = {}
+    four_files, unmatched = find_four_files(patterns)
+    for pattern in unmatched:
+        WindowsConsole.print_colored(f"FAILED {pattern}: No .four files match ❤️", 'red')
+        failed += 1
+    for four_file in four_files:
+        if not four_file.endswith('.four'):
+            WindowsConsole.print_colored(f"FAILED {four_file}: File must have .four extension ❤️", 'red')
+            failed += 1
+            continue
+        interpreter = FourInterpreter()
+        try:
+            interpreter.parse_file(four_file)
+        except FourError as e:
+            WindowsConsole.print_colored(f"FAILED {four_file}: {str(e)}", 'red')
+            failed += 1
+            continue
+        # Next to its .four, so the name of a project's .app never depends on what else is built
+        app_file = os.path.join(os.path.dirname(four_file), f"{interpreter.project_name}.app")
+        outputs.setdefault(os.path.realpath(app_file).lower(), []).append(four_file)
+        projects.append((four_file, app_file, interpreter))
+    # Projects in one folder sharing a PROJECT name would overwrite each other
+    clashing = {four_file for sources in outputs.values() if len(sources) > 1 for four_file in sources}
+    for four_file, app_file, _ in projects:
+        if four_file in clashing:
+            others = ', '.join(f for f in outputs[os.path.realpath(app_file).lower()] if f != four_file)
+            WindowsConsole.print_colored(f"FAILED {four_file}: {app_file} is also built from {others} ❤️", 'red')
+            failed += 1
+    projects = [project for project in projects if project[0] not in clashing]
+
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    built = up_to_date = 0
+
+    def report(four_file, app_file, result):
+        nonlocal built, up_to_date, failed
+        if result['error']:
+            failed += 1
+            WindowsConsole.print_colored(f"FAILED {four_file}: {result['error']} ({result['seconds']:.2f}s)", 'red')
+        elif result['built']:
+            built += 1
+            WindowsConsole.print_colored(f"Built {four_file} -> {app_file} ({result['seconds']:.2f}s)", 'green')
+        else:
+            up_to_date += 1
+            WindowsConsole.print_colored(f"Up to date {four_file} -> {app_file} ({result['seconds']:.2f}s)", 'green')
+        # Keep the project's own output (warnings included) together with its result
+        for line in result['log'].splitlines():
+            if result['error'] or 'Warning' in line:
+                print(f"    {line}")
+        sys.stdout.flush()
+
+    if jobs > 1 and len(projects) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(projects))) as pool:
+            futures = {pool.submit(build_project, interpreter, app_file, force): (four_file, app_file)
+                       for four_file, app_file, interpreter in projects}
+            for future in as_completed(futures):
+                report(*futures[future], future.result())
+    else:
+        for four_file, app_file, interpreter in projects:
+            report(four_file, app_file, build_project(interpreter, app_file, force))
+
+    WindowsConsole.print_colored(
+        f"{built} built, {up_to_date} up to date, {failed} failed in {time.perf_counter() - start:.2f}s ❤️",
+        'red' if failed else 'cyan')
+    return 1 if failed else 0
+
+def profile_option(args):
+    """Take --profile[=table|json] out of args, returning the rest and a profiler"""
+    fmt = None
+    rest = []
+    for arg in args:
+        if arg == '--profile' or arg.startswith('--profile='):
+            fmt = arg.partition('=')[2] or 'table'
+            if fmt not in FourProfiler.FORMATS:
+                raise FourError(f"Error with love: --profile can be {' or '.join(FourProfiler.FORMATS)}, not '{fmt}' ❤️")
+        else:
+            rest.append(arg)
+    return rest, FourProfiler(fmt)
+
 def main():
     if len(sys.argv) < 2:
         print("Four Programming Language - Windows Complete Version")
         print("Made with love ❤️")
         print()
         print("Usage:")
-        print("  four build <file.four>       - Compile project")
-        print("  four run <file.app>          - Execute application")
+        print("  four build [--force] [--jobs N] [--profile[=json]] <file.four|dir|glob>...")
+        print("                               - Compile projects")
+        print("  four run [--no-cache] [--log FILE] [--profile[=json]] <file.app>")
+        print("                               - Execute application")
         print("  four info <file.app>         - Show application info")
+        print("  four cache ls|prune|clear    - Manage extracted app cache")
         print("  four version                 - Show version")
         print("  four help                    - Show this help")
         return
 
     command = sys.argv[1].lower()
+    profiler = FourProfiler()
 
     try:
         if command in ("-v", "--version", "version"):
@@ -566,8 +1616,16 @@ def main():
             print()
             print("Commands:")
             print("  build <file.four>    - Compile a .four project into a .app file")
+            print("        --force        - Rebuild every entry instead of reusing the last .app")
+            print("        --jobs N       - Compress with N processes (0 uses every core)")
+            print("  build <dir|glob>...  - Compile many projects at once, one process per core")
             print("  run <file.app>       - Execute a compiled .app application")
+            print("        --log FILE     - Also write the app output to FILE as it runs")
+            print("  --profile[=json]     - Time each phase of build or run, on stderr")
             print("  info <file.app>      - Display detailed information about a .app file")
+            print("  cache ls             - List extracted apps kept for fast launches")
+            print("  cache prune [size]   - Evict least recently used apps down to size")
+            print("  cache clear          - Remove every extracted app")
             print("  version              - Show version information")
             print("  help                 - Show this help message")
             print()
@@ -577,35 +1635,88 @@ def main():
             print()
             print("Examples:")
             print("  four build myproject.four")
+            print("  four build --jobs 8 projects")
             print("  four run myproject.app")
+            print("  four run --log run.log myproject.app")
+            print("  four run --profile=json myproject.app")
             print("  four info myproject.app")
             return
 
         elif command == "build":
-            if len(sys.argv) != 3:
-                print("Error with love: Usage: four build <file.four> ❤️")
+            args, profiler = profile_option(sys.argv[2:])
+            force = '--force' in args
+            args = [arg for arg in args if arg != '--force']
+            jobs = None
+            if '--jobs' in args:
+                i = args.index('--jobs')
+                if i + 1 >= len(args) or not args[i + 1].isdigit():
+                    print("Error with love: --jobs needs a number (0 uses every core) ❤️")
+                    return
+                jobs = int(args[i + 1]) or os.cpu_count() or 1
+                del args[i:i + 2]
+            if not args:
+                print("Error with love: Usage: four build [--force] [--jobs N] [--profile[=json]] <file.four|dir|glob>... ❤️")
                 return
-            four_file = sys.argv[2]
+            if len(args) > 1 or os.path.isdir(args[0]) or glob.has_magic(args[0]):
+                if profiler.fmt:
+                    print("Error with love: --profile works with one project at a time ❤️")
+                    return
+                sys.exit(build_batch(args, force=force, jobs=jobs))
+            four_file = args[0]
             if not four_file.endswith('.four'):
                 print("Error with love: File must have .four extension ❤️")
                 return
             interpreter = FourInterpreter()
+            interpreter.profiler = profiler
             interpreter.parse_file(four_file)
             app_file = f"{interpreter.project_name}.app"
-            interpreter.build(app_file)
+            interpreter.build(app_file, force=force, jobs=jobs or 1)
 
         elif command == "run":
-            if len(sys.argv) != 3:
-                print("Error with love: Usage: four run <file.app> ❤️")
+            args, profiler = profile_option(sys.argv[2:])
+            use_cache = '--no-cache' not in args
+            args = [arg for arg in args if arg != '--no-cache']
+            log_file = None
+            if '--log' in args:
+                i = args.index('--log')
+                if i + 1 >= len(args):
+                    print("Error with love: --log needs a file to write the app output to ❤️")
+                    return
+                log_file = args[i + 1]
+                del args[i:i + 2]
+            if len(args) != 1:
+                print("Error with love: Usage: four run [--no-cache] [--log FILE] [--profile[=json]] <file.app> ❤️")
                 return
-            app_file = sys.argv[2]
+            app_file = args[0]
             if not app_file.endswith('.app'):
                 print("Error with love: File must have .app extension ❤️")
                 return
             interpreter = FourInterpreter()
-            exit_code = interpreter.run_app(app_file)
+            interpreter.profiler = profiler
+            exit_code = interpreter.run_app(app_file, cache=FourCache() if use_cache else None, log_file=log_file)
             sys.exit(exit_code)
 
+        elif command == "cache":
+            args = sys.argv[2:]
+            if not args or args[0] not in ('ls', 'prune', 'clear') or len(args) > 2 or (len(args) == 2 and args[0] != 'prune'):
+                print("Error with love: Usage: four cache ls | four cache prune [max-size] | four cache clear ❤️")
+                return
+            cache = FourCache()
+            if args[0] == 'ls':
+                entries = cache.entries()
+                for e in reversed(entries):
+                    last_used = datetime.fromtimestamp(e['last_used']).strftime('%Y-%m-%d %H:%M')
+                    print(f"{e['digest'][:12]}  {format_size(e['size']):>10}  {last_used}  {e['project'] or '?'}")
+                total = sum(e['size'] for e in entries)
+                WindowsConsole.print_colored(f"{len(entries)} apps, {format_size(total)} in {cache.root}", 'cyan')
+            elif args[0] == 'prune':
+                max_size = parse_size(args[1]) if len(args) == 2 else None
+                removed = cache.prune(max_size=max_size)
+                WindowsConsole.print_colored(f"Pruned {len(removed)} apps, freed {format_size(sum(e['size'] for e in removed))} ❤️", 'green')
+            else:
+                removed = cache.clear()
+                WindowsConsole.print_colored(f"Cleared {len(removed)} apps, freed {format_size(sum(e['size'] for e in removed))} ❤️", 'green')
+
         elif command == "info":
             if len(sys.argv) != 3:
                 print("Error with love: Usage: four info <file.app> ❤️")
@@ -630,6 +1741,8 @@ def main():
     except Exception as e:
         WindowsConsole.print_colored(f"Unexpected error with love: {str(e)} ❤️", 'red')
         sys.exit(1)
+    finally:
+        profiler.report()
 
 if __name__ == "__main__":
     main()